@@ -9,6 +9,7 @@ GCP_PROJECT_ID="valued-mediator-461216-k7" # Replace with your GCP Project ID
 GCP_REGION="us-central1" # Replace with your desired GCP region
 ARTIFACT_REGISTRY_REPO="my-adk-repo" # Replace with your Artifact Registry repo name
 CLOUD_RUN_SERVICE_NAME="venture-ai-service"
+FIRESTORE_DATABASE="ventureai"
 
 # --- Functions ---
 build_image() {
@@ -31,6 +32,41 @@ run_local() {
   echo "--- Container running. Access at http://localhost:8080 ---"
 }
 
+create_firestore_index() {
+  # Waits for the index build so the service never starts without it. An index that
+  # already exists is fine on redeploys; any other failure stops the deploy.
+  local output
+  if ! output=$(gcloud firestore indexes composite create \
+    --project="$GCP_PROJECT_ID" \
+    --database="$FIRESTORE_DATABASE" \
+    --query-scope=COLLECTION \
+    "$@" 2>&1); then
+    if [[ "$output" == *ALREADY_EXISTS* ]]; then
+      echo "Index already exists; skipping."
+    else
+      echo "$output" 1>&2
+      echo "Failed to create Firestore index; aborting deploy." 1>&2
+      exit 1
+    fi
+  fi
+}
+
+create_firestore_indexes() {
+  echo "--- Creating Firestore composite indexes ---"
+  # Session events are read in timestamp order (oldest-first and newest-first).
+  create_firestore_index --collection-group=events \
+    --field-config=field-path=timestamp.seconds,order=ascending \
+    --field-config=field-path=timestamp.nanos,order=ascending
+  create_firestore_index --collection-group=events \
+    --field-config=field-path=timestamp.seconds,order=descending \
+    --field-config=field-path=timestamp.nanos,order=descending
+  # The latest session for a user is looked up with a single ordered query.
+  create_firestore_index --collection-group=adk_sessions \
+    --field-config=field-path=app_name,order=ascending \
+    --field-config=field-path=user_id,order=ascending \
+    --field-config=field-path=updateTime,order=descending
+}
+
 deploy_to_cloud_run() {
   echo "--- Deploying to Cloud Run ---"
   
@@ -43,6 +79,8 @@ deploy_to_cloud_run() {
   gcloud auth configure-docker "${GCP_REGION}-docker.pkg.dev" --quiet
   docker push "$ARTIFACT_REGISTRY_IMAGE_TAG"
   
+  create_firestore_indexes
+
   # Deploy to Cloud Run
   echo "--- Deploying image to Cloud Run service: $CLOUD_RUN_SERVICE_NAME ---"
   gcloud run deploy "$CLOUD_RUN_SERVICE_NAME" \
@@ -51,6 +89,7 @@ deploy_to_cloud_run() {
     --region="$GCP_REGION" \
     --project="$GCP_PROJECT_ID" \
     --allow-unauthenticated \
+    --no-cpu-throttling \
     --set-env-vars="GCS_BUCKET_NAME=valued-mediator-461216-k7.firebasestorage.app,PROJECT_ID=valued-mediator-461216-k7,LOCATION=us-central1,DATABASE=ventureai,GOOGLE_API_KEY=YOUR_API_KEY" \
     --quiet
     
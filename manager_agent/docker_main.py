@@ -1,25 +1,29 @@
-from fastapi import FastAPI
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Query
 from pydantic import BaseModel
 from .firestore.firestore_session_service import FirestoreSessionService
+from .firestore.firestore_job_store import FirestoreJobStore
 from google.adk.runners import Runner
 from google.genai.types import Content, Part, Blob
 from .agent import root_agent
+from .pdf_report import generate_pdf_from_json
 import os
+import asyncio
 from dotenv import load_dotenv
 from typing import Optional, Dict, Any
-import requests
-import json
+import httpx
+from cachetools import TTLCache
+import orjson
 import uuid
 from datetime import datetime
 import io
+import re
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 from google.cloud import bigquery, storage
 from google.cloud.exceptions import NotFound
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response, StreamingResponse
 
 load_dotenv()
 
@@ -29,8 +33,24 @@ DATABASE = os.getenv("DATABASE")
 BIGQUERY_DATASET_ID = os.getenv("BIGQUERY_DATASET_ID", "venture_ai_test_dataset")
 BIGQUERY_TABLE_ID = os.getenv("BIGQUERY_TABLE_ID", "pitch_deck_analysis")
 GCS_BUCKET_NAME = os.getenv("GCS_BUCKET_NAME") # User needs to set this in .env
+BIGQUERY_BATCH_SIZE = int(os.getenv("BIGQUERY_BATCH_SIZE", "500"))
+BIGQUERY_BATCH_MAX_WAIT = float(os.getenv("BIGQUERY_BATCH_MAX_WAIT", "1.0")) # Seconds
+BLOCKING_IO_THREADS = int(os.getenv("BLOCKING_IO_THREADS", "64"))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(os.cpu_count() or 1)))
+# Columns the investor dashboard actually renders
+DASHBOARD_COLUMNS = [
+    "analysis_id",
+    "company_name",
+    "tech_field",
+    "company_website",
+    "date",
+    "recommendation",
+    "generated_pdf_url",
+]
 
 # --- FastAPI App ---
+# Handlers declare typed response models: FastAPI then has Pydantic serialize the result
+# straight to JSON bytes instead of walking it with jsonable_encoder first.
 app = FastAPI()
 
 app.add_middleware(
@@ -44,17 +64,75 @@ app.add_middleware(
 # --- Services ---
 session_service = FirestoreSessionService(project=PROJECT_ID, database=DATABASE)
 runner = Runner(app_name="venture-ai", agent=root_agent, session_service=session_service)
+job_store = FirestoreJobStore(project=PROJECT_ID, database=DATABASE)
 bigquery_client = bigquery.Client(project=PROJECT_ID)
 storage_client = storage.Client(project=PROJECT_ID)
+# Analysis rows waiting to be streamed into BigQuery by bq_flusher().
+bq_queue: asyncio.Queue = asyncio.Queue()
+# Set once prepare_bigquery() has made sure the analysis table exists.
+bq_ready = asyncio.Event()
+# user_id -> (session_id, state) for /create_session; dropped whenever a handler changes the state.
+SESSION_CACHE = TTLCache(maxsize=10_000, ttl=300)
+
+# BigQuery column -> path of keys into the report agent's InvestmentMemo output
+MEMO_FIELD_MAP = [
+    ("company_name", ("company_name",)),
+    ("introduction", ("summary",)),
+    ("problem", ("problem_definition",)),
+    ("product_description", ("solution_description",)),
+    ("business_model", ("business_model",)),
+    ("market_competition", ("competitive_advantage",)),
+    ("founders", ("team_analysis", "founders")),
+    ("team_strengths", ("team_analysis", "background_summary")),
+    ("key_strengths", ("team_analysis", "strengths")),
+    ("market_size_tam", ("market_opportunity", "market_size_tam")),
+    ("market_size_som", ("market_opportunity", "market_size_sam")),
+    ("market_growth_rate", ("market_opportunity", "market_growth_rate")),
+    ("opportunity", ("market_opportunity", "analysis")),
+    ("impact_metrics", ("traction", "metrics")),
+    ("customer_feedback", ("traction", "customer_feedback")),
+    ("round_size", ("financials", "funding_ask_inr")),
+    ("use_of_funds", ("financials", "use_of_funds")),
+    ("growth_trajectory", ("financials", "projections_summary")),
+    ("recommendation", ("investment_recommendation", "recommendation")),
+    ("justification", ("investment_recommendation", "justification")),
+    ("technical_risk", ("investment_recommendation", "risks")),
+]
+
+# Agent output that is a JSON object, optionally wrapped in a ```json code fence
+_JSON_FENCE = re.compile(r"\s*(?:```(?:json)?\s*)?(\{.*\})\s*(?:```)?\s*", re.S)
 
 # --- Helper Functions ---
 _bigquery_table_checked = False
 
+def project_memo_row(memo_data):
+    """Projects the memo onto the BigQuery STRING columns in a single pass over MEMO_FIELD_MAP."""
+    row = {}
+    for column, path in MEMO_FIELD_MAP:
+        value = memo_data
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        if isinstance(value, (list, dict)):
+            value = orjson.dumps(value).decode()
+        elif value is not None and not isinstance(value, str):
+            value = str(value)
+        row[column] = value
+    return row
+
 def setup_bigquery_table():
-    """Creates the BigQuery dataset and table with the correct, comprehensive schema."""
+    """
+    Creates the BigQuery dataset and table with the correct, comprehensive schema.
+
+    Deployments where the table already exists set BQ_BOOTSTRAPPED=1 to skip the
+    get_dataset/get_table round trips on every cold start. Without it (e.g. local
+    dev), the table is checked and created on demand.
+    """
     global _bigquery_table_checked
     if _bigquery_table_checked:
         return
+    if os.getenv("BQ_BOOTSTRAPPED") == "1":
+        _bigquery_table_checked = True
+        return
 
     dataset_ref_str = f"{PROJECT_ID}.{BIGQUERY_DATASET_ID}"
     table_ref_str = f"{dataset_ref_str}.{BIGQUERY_TABLE_ID}"
@@ -107,30 +185,96 @@ def setup_bigquery_table():
         print(f"Table '{BIGQUERY_TABLE_ID}' created successfully.")
     _bigquery_table_checked = True
 
-def generate_pdf_from_json(json_data):
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    styles = getSampleStyleSheet()
-    story = []
-    def add_section(title, content, level=1):
-        if title:
-            style = styles["Heading1"] if level == 1 else styles["Heading2"]
-            story.append(Paragraph(title, style))
-        story.append(Spacer(1, 8))
-        if isinstance(content, dict):
-            for k, v in content.items():
-                add_section(k.replace("_", " ").title(), v, level + 1)
-        elif isinstance(content, list):
-            for item in content:
-                add_section(None, item, level + 1)
-        else:
-            story.append(Paragraph(str(content), styles["Normal"]))
-            story.append(Spacer(1, 6))
-    add_section("Investment Memo", json_data.get("investment_memo", json_data))
-    doc.build(story)
-    pdf_bytes = buffer.getvalue()
-    buffer.close()
-    return pdf_bytes
+async def prepare_bigquery():
+    """Runs setup_bigquery_table off the startup path, then releases anything waiting on the table."""
+    try:
+        await asyncio.to_thread(setup_bigquery_table)
+    except Exception as e:
+        print(f"BigQuery setup failed: {e}")
+    finally:
+        # Waiters proceed even on failure; their own BigQuery calls will surface the error.
+        bq_ready.set()
+
+async def insert_bigquery_rows(rows):
+    """Streams rows into the analysis table, one insert_rows_json call per batch."""
+    await bq_ready.wait()
+    table_ref_str = f"{PROJECT_ID}.{BIGQUERY_DATASET_ID}.{BIGQUERY_TABLE_ID}"
+    for start in range(0, len(rows), BIGQUERY_BATCH_SIZE):
+        batch = rows[start:start + BIGQUERY_BATCH_SIZE]
+        try:
+            errors = await asyncio.to_thread(bigquery_client.insert_rows_json, table_ref_str, batch)
+        except Exception as e:
+            print(f"BigQuery insertion of {len(batch)} rows failed: {e}")
+            continue
+        if errors:
+            print(f"BigQuery insertion failed: {errors}")
+
+async def bq_flusher():
+    """
+    Drains bq_queue in the background, flushing once BIGQUERY_BATCH_SIZE rows are
+    pending or BIGQUERY_BATCH_MAX_WAIT seconds have passed since the first one arrived.
+    """
+    loop = asyncio.get_running_loop()
+    rows = []
+    try:
+        while True:
+            rows.append(await bq_queue.get())
+            deadline = loop.time() + BIGQUERY_BATCH_MAX_WAIT
+            while len(rows) < BIGQUERY_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    rows.append(await asyncio.wait_for(bq_queue.get(), timeout=timeout))
+                except asyncio.TimeoutError:
+                    break
+            batch, rows = rows, []
+            await insert_bigquery_rows(batch)
+    except asyncio.CancelledError:
+        # Flush whatever is still pending before the instance shuts down.
+        while not bq_queue.empty():
+            rows.append(bq_queue.get_nowait())
+        if rows:
+            await insert_bigquery_rows(rows)
+        raise
+
+async def warm_up_clients():
+    """Opens the BigQuery and Firestore connections before the first user request needs them."""
+    try:
+        await asyncio.gather(
+            asyncio.to_thread(lambda: bigquery_client.query("SELECT 1").result()),
+            session_service.warm_up(),
+        )
+    except Exception as e:
+        print(f"Client warm-up failed: {e}")
+
+async def stream_agent_text(user_id, session_id, new_message):
+    """
+    Runs the agent and yields each text part as it is produced.
+
+    Partial (streaming) events are skipped since their text is repeated in the
+    aggregated event that follows. The run is always consumed to the end rather than
+    stopped at the first final response: in the memo pipeline every sub-agent emits
+    one, and the runner persists events as it goes.
+    """
+    async for event in runner.run_async(
+        user_id=user_id,
+        session_id=session_id,
+        new_message=new_message,
+    ):
+        if event.partial:
+            continue
+        if event.content and event.content.parts:
+            for part in event.content.parts:
+                if part.text:
+                    yield part.text
+
+def upload_pdf(blob, pdf_buffer):
+    """Uploads a generated memo PDF to GCS and makes it publicly readable."""
+    blob.upload_from_file(
+        pdf_buffer, rewind=True, size=pdf_buffer.getbuffer().nbytes, content_type='application/pdf'
+    )
+    blob.make_public()
 
 # --- Pydantic Models ---
 class CreateSessionRequest(BaseModel):
@@ -161,33 +305,86 @@ class FollowupQuestionRequest(BaseModel):
     user_id: str
     session_id: str
 
+class SessionResponse(BaseModel):
+    session_id: str
+    state: Dict[str, Any]
+
+class QueryResponse(BaseModel):
+    agent_response: str
+
+class AgentMessageResponse(BaseModel):
+    message: str
+    agent_response: str
+
+class AnalysisQueuedResponse(BaseModel):
+    message: str
+    job_id: str
+    analysis_id: str
+
 # --- API Endpoints ---
 @app.on_event("startup")
 async def startup_event():
-    setup_bigquery_table()
+    # Blocking GCS/BigQuery calls run via asyncio.to_thread on the loop's default executor.
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=BLOCKING_IO_THREADS))
+    # Table bootstrap and connection warm-up run in the background so the instance
+    # starts answering health checks immediately.
+    app.state.bq_setup = asyncio.create_task(prepare_bigquery())
+    app.state.warm_up = asyncio.create_task(warm_up_clients())
+    # PDF rendering is CPU-bound, so it runs in worker processes to get around the GIL.
+    # "spawn" keeps the workers from inheriting this process's gRPC channels; they
+    # only import the lightweight pdf_report module.
+    app.state.pdf_pool = ProcessPoolExecutor(
+        max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn")
+    )
+    # Shared async HTTP client so pitch deck downloads don't block the event loop.
+    # Its pool keeps connections alive across downloads and retries failed connects.
+    app.state.http = httpx.AsyncClient(
+        timeout=60,
+        follow_redirects=True,
+        transport=httpx.AsyncHTTPTransport(
+            http2=True,
+            retries=3,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        ),
+    )
+    app.state.bq_flusher = asyncio.create_task(bq_flusher())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    app.state.bq_flusher.cancel()
+    try:
+        await app.state.bq_flusher
+    except asyncio.CancelledError:
+        pass
+    await app.state.http.aclose()
+    app.state.pdf_pool.shutdown()
 
 @app.get("/")
-def read_root():
+def read_root() -> Dict[str, str]:
     return {"Hello": "World"}
 
 @app.post("/create_session")
-async def create_session(request: CreateSessionRequest):
+async def create_session(request: CreateSessionRequest) -> SessionResponse:
     """Creates a new session or reuses an existing one and returns the session ID and state."""
     
+    cached = SESSION_CACHE.get(request.user_id)
+    if cached:
+        session_id, session_state = cached
+        return SessionResponse(session_id=session_id, state=session_state)
+
     print(f"Checking for existing sessions for user '{request.user_id}'...")
-    list_sessions_response = await session_service.list_sessions(app_name="venture-ai", user_id=request.user_id)
+    remote_session = await session_service.list_sessions_latest(app_name="venture-ai", user_id=request.user_id)
     
     session_id = None
     session_state = {}
 
-    if list_sessions_response and list_sessions_response.sessions:
-        remote_session = list_sessions_response.sessions[0]
+    if remote_session:
         session_id = remote_session.id
         session_state = remote_session.state
         print(f"Found existing session with ID: {session_id}")
     else:
         print(f"No existing sessions for user '{request.user_id}'. Creating a new one.")
-        new_session = await session_service.create_session(user_id=request.user_id, state=request.initial_state)
+        new_session = await session_service.create_session(app_name="venture-ai", user_id=request.user_id, state=request.initial_state)
         session_id = new_session.id
         session_state = new_session.state
         print(f"Created new session with ID: {session_id}")
@@ -195,43 +392,40 @@ async def create_session(request: CreateSessionRequest):
     if not session_id:
          raise Exception("Failed to get or create a session ID.")
 
-    response_data = json.dumps({"session_id": session_id, "state": session_state})
-    return JSONResponse(content=response_data)
+    SESSION_CACHE[request.user_id] = (session_id, session_state)
+    return SessionResponse(session_id=session_id, state=session_state)
 
 
 @app.post("/query")
-async def query(request: QueryRequest):
+async def query(request: QueryRequest) -> QueryResponse:
     """Runs a query against the agent and returns the response."""
     new_message = Content(role="user", parts=[Part(text=request.message)])
     
-    response_chunks = []
-    async for event in runner.run_async(
-        user_id=request.user_id,
-        session_id=request.session_id,
-        new_message=new_message,
-    ):
-        if event.content and event.content.parts:
-            for part in event.content.parts:
-                if part.text:
-                    response_chunks.append(part.text)
+    final_response = ""
+    async for text in stream_agent_text(request.user_id, request.session_id, new_message):
+        final_response = text
 
-    if not response_chunks:
-        final_response = ""
-    else:
-        final_response = response_chunks[-1]
+    return QueryResponse(agent_response=final_response)
+
+@app.post("/query_stream")
+async def query_stream(request: QueryRequest):
+    """Runs a query against the agent and streams the response text as it is generated."""
+    new_message = Content(role="user", parts=[Part(text=request.message)])
 
-    response_data = json.dumps({"agent_response": final_response})
-    return JSONResponse(content=response_data)
+    async def _encode():
+        async for text in stream_agent_text(request.user_id, request.session_id, new_message):
+            yield text.encode()
 
-@app.post("/generate_investment_analysis")
-async def generate_investment_analysis(request: GenerateInvestmentAnalysisRequest):
+    return StreamingResponse(_encode(), media_type="text/plain")
+
+async def analyse_pitch_deck(analysis_id, request):
     """
-    Runs an investment analysis on a pitch deck and returns the analysis as JSON.
+    Runs an investment analysis on a pitch deck, then stores the memo PDF, BigQuery
+    row and session state. Returns the result, or an "error" dict if the agent output
+    can't be used.
     """
-    analysis_id = str(uuid.uuid4())
-
     # Download the PDF from the URL
-    response = requests.get(request.pdf_url)
+    response = await app.state.http.get(request.pdf_url)
     response.raise_for_status()
     pdf_data = response.content
 
@@ -242,90 +436,47 @@ async def generate_investment_analysis(request: GenerateInvestmentAnalysisReques
     ]
     new_message = Content(role="user", parts=message_parts)
 
-    # Run the query against the agent
-    response_chunks = []
-    async for event in runner.run_async(
-        user_id=request.user_id,
-        session_id=request.session_id,
-        new_message=new_message,
-    ):
-        if event.content and event.content.parts:
-            for part in event.content.parts:
-                if part.text:
-                    response_chunks.append(part.text)
-
-    if not response_chunks:
-        response_data = json.dumps({"error": "Agent returned no response."})
-        return JSONResponse(content={"response_data": response_data})
+    # Run the query against the agent; only the last text part (the memo) is needed
+    final_response_text = None
+    async for text in stream_agent_text(request.user_id, request.session_id, new_message):
+        final_response_text = text
 
-    final_response_text = response_chunks[-1]
+    if final_response_text is None:
+        return {"error": "Agent returned no response."}
     
-    if final_response_text.strip().startswith("```json"):
-        final_response_text = final_response_text[final_response_text.find('{'):final_response_text.rfind('}')+1]
+    # Strip an optional ```json fence in a single pass; anything else is parsed as-is
+    match = _JSON_FENCE.fullmatch(final_response_text)
+    payload = match.group(1) if match else final_response_text
 
     try:
-        analysis_data = json.loads(final_response_text)
-    except json.JSONDecodeError as e:
-        response_data = json.dumps({"error": f"Failed to decode JSON from agent response: {e}", "raw_response": final_response_text})
-        return JSONResponse(content={"response_data": response_data})
-
-    # Generate and upload PDF
-    pdf_bytes = generate_pdf_from_json(analysis_data)
+        analysis_data = orjson.loads(payload)
+    except orjson.JSONDecodeError as e:
+        return {"error": f"Failed to decode JSON from agent response: {e}", "raw_response": final_response_text}
+
+    # Generate the PDF. Its public URL is derived from the blob name, so it is
+    # known before the upload finishes.
+    pdf_buffer = await asyncio.get_running_loop().run_in_executor(
+        app.state.pdf_pool, generate_pdf_from_json, analysis_data
+    )
     if not GCS_BUCKET_NAME:
         raise ValueError("GCS_BUCKET_NAME environment variable not set.")
     bucket = storage_client.bucket(GCS_BUCKET_NAME)
     blob = bucket.blob(f"investment_memos/{analysis_id}.pdf")
-    blob.upload_from_string(pdf_bytes, content_type='application/pdf')
-    blob.make_public()
     generated_pdf_url = blob.public_url
 
-    # Insert into BigQuery
-    table_ref_str = f"{PROJECT_ID}.{BIGQUERY_DATASET_ID}.{BIGQUERY_TABLE_ID}"
-    memo_data = analysis_data.get("investment_memo", analysis_data)
+    # Build the BigQuery row
     row_to_insert = {
         "analysis_id": analysis_id,
         "user_id": request.user_id,
         "generated_pdf_url": generated_pdf_url,
-        "company_name": memo_data.get("company_name"),
         "tech_field": request.tech_field,
         "company_website": request.company_website,
         "date": datetime.now().strftime("%Y-%m-%d"),
         "author": "VentureAI Agent",
-        "introduction": memo_data.get("summary"),
-        "problem": memo_data.get("problem_definition"),
-        "product_description": memo_data.get("solution_description"),
-        "business_model": memo_data.get("business_model"),
-        "market_competition": memo_data.get("competitive_advantage"),
     }
-    if team_analysis := memo_data.get("team_analysis"):
-        row_to_insert["founders"] = team_analysis.get("founders")
-        row_to_insert["team_strengths"] = team_analysis.get("background_summary")
-        row_to_insert["key_strengths"] = team_analysis.get("strengths")
-    if market_opportunity := memo_data.get("market_opportunity"):
-        row_to_insert["market_size_tam"] = market_opportunity.get("market_size_tam")
-        row_to_insert["market_size_som"] = market_opportunity.get("market_size_sam")
-        row_to_insert["market_growth_rate"] = market_opportunity.get("market_growth_rate")
-        row_to_insert["opportunity"] = market_opportunity.get("analysis")
-    if traction := memo_data.get("traction"):
-        row_to_insert["impact_metrics"] = traction.get("metrics")
-        row_to_insert["customer_feedback"] = traction.get("customer_feedback")
-    if financials := memo_data.get("financials"):
-        row_to_insert["round_size"] = str(financials.get("funding_ask_inr"))
-        row_to_insert["use_of_funds"] = financials.get("use_of_funds")
-        row_to_insert["growth_trajectory"] = financials.get("projections_summary")
-    if investment_recommendation := memo_data.get("investment_recommendation"):
-        row_to_insert["recommendation"] = investment_recommendation.get("recommendation")
-        row_to_insert["justification"] = investment_recommendation.get("justification")
-        row_to_insert["technical_risk"] = investment_recommendation.get("risks")
-    for key, value in row_to_insert.items():
-        if isinstance(value, (list, dict)):
-            row_to_insert[key] = json.dumps(value)
-    
-    errors = bigquery_client.insert_rows_json(table_ref_str, [row_to_insert])
-    if errors:
-        raise Exception(f"BigQuery insertion failed: {errors}")
+    row_to_insert.update(project_memo_row(analysis_data.get("investment_memo", analysis_data)))
 
-    # Update session state
+    # Build the session state update
     state_delta = {
         "analysis_id": analysis_id,
         "generated_pdf_url": generated_pdf_url,
@@ -334,80 +485,110 @@ async def generate_investment_analysis(request: GenerateInvestmentAnalysisReques
         "short_description": request.short_description,
         "pitch_deck_url": request.pdf_url
     }
+
+    # Upload the PDF first: the row and session state both point at it, so neither
+    # may be written if the upload fails.
+    await asyncio.to_thread(upload_pdf, blob, pdf_buffer)
     await session_service.update_session_state(request.session_id, state_delta)
+    await bq_queue.put(row_to_insert)
+    SESSION_CACHE.pop(request.user_id, None)
 
-    response_data = json.dumps({"message": "Analysis complete", "analysis_id": analysis_id, "generated_pdf_url": generated_pdf_url})
-    return JSONResponse(content=response_data)
+    return {"message": "Analysis complete", "analysis_id": analysis_id, "generated_pdf_url": generated_pdf_url}
+
+async def run_analysis_job(analysis_id, request):
+    """Background worker for /generate_investment_analysis; records the outcome on the job."""
+    try:
+        await job_store.update_job(analysis_id, "running")
+        result = await analyse_pitch_deck(analysis_id, request)
+    except Exception as e:
+        print(f"Analysis job '{analysis_id}' failed: {e}")
+        await job_store.update_job(analysis_id, "failed", error=str(e))
+        return
+    if "error" in result:
+        await job_store.update_job(analysis_id, "failed", **result)
+    else:
+        await job_store.update_job(analysis_id, "complete", generated_pdf_url=result["generated_pdf_url"])
+
+@app.post("/generate_investment_analysis", status_code=202)
+async def generate_investment_analysis(request: GenerateInvestmentAnalysisRequest, background_tasks: BackgroundTasks) -> AnalysisQueuedResponse:
+    """
+    Queues an investment analysis of a pitch deck and returns its job ID right away.
+    Poll /analysis_jobs/{job_id} for the status and, once complete, the generated PDF URL.
+    """
+    analysis_id = str(uuid.uuid4())
+    await job_store.create_job(analysis_id, {"user_id": request.user_id, "session_id": request.session_id})
+    background_tasks.add_task(run_analysis_job, analysis_id, request)
+    return AnalysisQueuedResponse(message="Analysis queued", job_id=analysis_id, analysis_id=analysis_id)
+
+@app.get("/analysis_jobs/{job_id}")
+async def get_analysis_job(job_id: str) -> Dict[str, Any]:
+    """Returns the status of a queued investment analysis."""
+    job = await job_store.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Analysis job '{job_id}' not found.")
+    return job
 
 @app.get("/get_investor_dashboard_data")
-async def get_investor_dashboard_data():
+async def get_investor_dashboard_data(
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+):
     """
-    Fetches all rows from the BigQuery pitch deck analysis table for the investor dashboard.
+    Fetches a page of pitch deck analyses from BigQuery, newest first, for the investor dashboard.
     """
     table_ref_str = f"{PROJECT_ID}.{BIGQUERY_DATASET_ID}.{BIGQUERY_TABLE_ID}"
-    query = f"SELECT * FROM `{table_ref_str}`"
-    
-    query_job = bigquery_client.query(query)
-    rows = [dict(row) for row in query_job]
+    query = (
+        f"SELECT {', '.join(DASHBOARD_COLUMNS)} FROM `{table_ref_str}` "
+        "ORDER BY date DESC LIMIT @limit OFFSET @offset"
+    )
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ScalarQueryParameter("limit", "INT64", limit),
+            bigquery.ScalarQueryParameter("offset", "INT64", offset),
+        ]
+    )
+    await bq_ready.wait()
+
+    def _fetch_rows():
+        query_job = bigquery_client.query(query, job_config=job_config)
+        return [dict(row) for row in query_job.result(page_size=limit)]
+
+    rows = await asyncio.to_thread(_fetch_rows)
     
-    response_data = json.dumps(rows, default=str)
-    return JSONResponse(content=response_data)
+    return Response(content=orjson.dumps(rows, default=str), media_type="application/json")
 
 @app.post("/investor_query")
-async def investor_query(request: InvestorQueryRequest):
+async def investor_query(request: InvestorQueryRequest) -> AgentMessageResponse:
     """
     Handles an investor query by updating the session state and running the query against the agent.
     """
     # Update session state with analysis_id
     state_delta = {"id_to_analyse": request.analysis_id}
     await session_service.update_session_state(request.session_id, state_delta)
+    SESSION_CACHE.pop(request.user_id, None)
 
     # Create the message for the agent
     new_message = Content(role="user", parts=[Part(text=request.prompt)])
 
     # Run the query against the agent
-    response_chunks = []
-    async for event in runner.run_async(
-        user_id=request.user_id,
-        session_id=request.session_id,
-        new_message=new_message,
-    ):
-        if event.content and event.content.parts:
-            for part in event.content.parts:
-                if part.text:
-                    response_chunks.append(part.text)
-
-    if not response_chunks:
-        final_response = ""
-    else:
-        final_response = "".join(response_chunks)
+    response_buffer = io.StringIO()
+    async for text in stream_agent_text(request.user_id, request.session_id, new_message):
+        response_buffer.write(text)
+    final_response = response_buffer.getvalue()
     
-    response_data = json.dumps({"message": "Query processed", "agent_response": final_response})
-    return JSONResponse(content=response_data)
+    return AgentMessageResponse(message="Query processed", agent_response=final_response)
 
 @app.post("/followup_question")
-async def followup_question(request: FollowupQuestionRequest):
+async def followup_question(request: FollowupQuestionRequest) -> AgentMessageResponse:
     """
     Generates follow-up questions for the founder based on the analysis.
     """
     prompt = "provide me follow up questins for the founder based on the analysis. Also provide the questions as a json."
     new_message = Content(role="user", parts=[Part(text=prompt)])
 
-    response_chunks = []
-    async for event in runner.run_async(
-        user_id=request.user_id,
-        session_id=request.session_id,
-        new_message=new_message,
-    ):
-        if event.content and event.content.parts:
-            for part in event.content.parts:
-                if part.text:
-                    response_chunks.append(part.text)
-
-    if not response_chunks:
-        full_response_text = ""
-    else:
-        full_response_text = "".join(response_chunks)
+    response_buffer = io.StringIO()
+    async for text in stream_agent_text(request.user_id, request.session_id, new_message):
+        response_buffer.write(text)
+    full_response_text = response_buffer.getvalue()
 
-    response_data = json.dumps({"message": "Follow-up questions generated", "agent_response": full_response_text})
-    return JSONResponse(content=response_data)
\ No newline at end of file
+    return AgentMessageResponse(message="Follow-up questions generated", agent_response=full_response_text)
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""
+Tracks long-running analysis jobs in Google Cloud Firestore so clients can poll
+for their progress instead of holding a request open.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from google.cloud import firestore
+
+JOBS_COLLECTION = "analysis_jobs"
+
+
+class FirestoreJobStore:
+    def __init__(self, project: Optional[str] = None, database: Optional[str] = None):
+        """Initializes the FirestoreJobStore with the async client."""
+        self._db = firestore.AsyncClient(project=project, database=database)
+
+    async def create_job(self, job_id: str, data: Dict[str, Any]) -> None:
+        """Creates a job document in the 'queued' state."""
+        await self._db.collection(JOBS_COLLECTION).document(job_id).set({
+            **data,
+            "job_id": job_id,
+            "status": "queued",
+            "createTime": firestore.SERVER_TIMESTAMP,
+            "updateTime": firestore.SERVER_TIMESTAMP,
+        })
+
+    async def update_job(self, job_id: str, status: str, **fields: Any) -> None:
+        """Moves a job to a new status, recording any result or error fields with it."""
+        await self._db.collection(JOBS_COLLECTION).document(job_id).update({
+            **fields,
+            "status": status,
+            "updateTime": firestore.SERVER_TIMESTAMP,
+        })
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Returns the job document as a JSON-ready dict, or None if it doesn't exist."""
+        doc = await self._db.collection(JOBS_COLLECTION).document(job_id).get()
+        if not doc.exists:
+            return None
+        job = doc.to_dict()
+        for key in ("createTime", "updateTime"):
+            if job.get(key):
+                job[key] = job[key].isoformat()
+        return job
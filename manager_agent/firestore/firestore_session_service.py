@@ -14,7 +14,8 @@
 
 """
 Implements a session service using Google Cloud Firestore for storage.
-This version uses the synchronous Firestore client to prevent event loop errors.
+This version uses the native Firestore AsyncClient so calls are awaited on the
+event loop instead of occupying a worker thread each.
 """
 from __future__ import annotations
 
@@ -22,11 +23,24 @@ import asyncio
 import logging
 from typing import Any, Dict, Optional
 
+import grpc
+import orjson
+from cachetools import TTLCache
 from google.cloud import firestore
 from google.cloud.firestore_v1.base_query import FieldFilter
+from google.cloud.firestore_v1.services.firestore import async_client as firestore_api_client
+from google.cloud.firestore_v1.services.firestore.transports.grpc_asyncio import (
+    FirestoreGrpcAsyncIOTransport,
+)
+
+try:
+    # Private to the client library; see _CompressedAsyncClient.
+    from google.cloud.firestore_v1.base_client import _DEFAULT_CHANNEL_OPTIONS
+except ImportError:
+    _DEFAULT_CHANNEL_OPTIONS = None
 from typing_extensions import override
 
-from google.genai.types import Content
+from google.genai.types import Content, Part
 
 from google.adk.sessions import Session
 from google.adk.events.event import Event
@@ -43,13 +57,71 @@ logger.setLevel(logging.INFO)
 
 SESSIONS_COLLECTION = "adk_sessions"
 EVENTS_SUBCOLLECTION = "events"
+# Multi-turn conversations re-read the same session many times in quick succession.
+SESSION_CACHE_SIZE = 1024
+SESSION_CACHE_TTL = 5  # seconds
+# Uploaded pitch decks are replaced with this in the stored history.
+_PDF_PLACEHOLDER_PART = Part(text='[PDF content omitted from history]')
+
+
+class _CompressedAsyncClient(firestore.AsyncClient):
+    """
+    AsyncClient whose gRPC channel gzips messages. Event documents carry memo-sized
+    JSON text that compresses well. The client has no public option for this, so the
+    channel is built the same way the base class builds it, plus compression. It has to
+    stay lazy: a grpc.aio channel is bound to the event loop it is first used on.
+
+    Its class name no longer matches the "AsyncClient" check BulkWriter uses to switch to
+    a sync client, so it must not be handed to bulk_writer(); bulk deletes use a separate
+    sync client.
+
+    This mirrors private internals of google-cloud-firestore 2.x (written against 2.34).
+    If any of them is missing in another release, the client falls back to the stock,
+    uncompressed channel rather than failing.
+    """
+
+    @property
+    def _firestore_api(self):
+        if (
+            _DEFAULT_CHANNEL_OPTIONS is not None
+            and getattr(self, "_firestore_api_internal", False) is None
+            and getattr(self, "_emulator_host", False) is None
+        ):
+            try:
+                target = self._target
+                credentials = self._credentials
+                client_options = self._client_options
+                client_info = self._client_info
+            except AttributeError:
+                return super()._firestore_api
+            channel = FirestoreGrpcAsyncIOTransport.create_channel(
+                target,
+                credentials=credentials,
+                options=_DEFAULT_CHANNEL_OPTIONS,
+                compression=grpc.Compression.Gzip,
+            )
+            self._transport = FirestoreGrpcAsyncIOTransport(host=target, channel=channel)
+            self._firestore_api_internal = firestore_api_client.FirestoreAsyncClient(
+                transport=self._transport, client_options=client_options
+            )
+            firestore_api_client._client_info = client_info
+        return super()._firestore_api
 
 
 class FirestoreSessionService(BaseSessionService):
     def __init__(self, project: Optional[str] = None, database: Optional[str] = None):
-        """Initializes the FirestoreSessionService with the synchronous client."""
-        # Use the standard synchronous client instead of the AsyncClient
-        self._db = firestore.Client(project=project, database=database)
+        """Initializes the FirestoreSessionService with the async client."""
+        # A single AsyncClient is safe to share across coroutines.
+        self._db = _CompressedAsyncClient(project=project, database=database)
+        # BulkWriter is a synchronous API and needs a sync client; it is used for deletes only.
+        self._bulk_db = firestore.Client(project=project, database=database)
+        # session_id -> in-flight or completed fetch of the full session. Storing the
+        # task rather than its result lets concurrent readers share one Firestore read.
+        self._session_cache: TTLCache = TTLCache(maxsize=SESSION_CACHE_SIZE, ttl=SESSION_CACHE_TTL)
+
+    async def warm_up(self) -> None:
+        """Opens the Firestore gRPC channel with a single point read so the first request doesn't pay for it."""
+        await self._db.collection(SESSIONS_COLLECTION).document("warmup").get()
 
     @override
     async def create_session(
@@ -60,32 +132,26 @@ class FirestoreSessionService(BaseSessionService):
         state: Optional[dict[str, Any]] = None,
         session_id: Optional[str] = None,
     ) -> Session:
-        """Creates a new session document in Firestore using a thread."""
+        """Creates a new session document in Firestore."""
         if session_id:
             raise ValueError("User-provided session ID is not supported.")
 
-        def _create_in_firestore():
-            session_data = {
-                "app_name": app_name,
-                "user_id": user_id,
-                "state": state or {},
-                "createTime": firestore.SERVER_TIMESTAMP,
-                "updateTime": firestore.SERVER_TIMESTAMP,
-            }
-            # These are now synchronous calls
-            _, doc_ref = self._db.collection(SESSIONS_COLLECTION).add(session_data)
-            doc = doc_ref.get()
-            doc_dict = doc.to_dict()
-            return Session(
-                app_name=doc_dict["app_name"],
-                user_id=doc_dict["user_id"],
-                id=doc.id,
-                state=doc_dict.get("state", {}),
-                last_update_time=doc_dict["updateTime"].timestamp(),
-            )
-
-        # Run the synchronous DB calls in a separate thread to not block the async server
-        return await asyncio.to_thread(_create_in_firestore)
+        session_data = {
+            "app_name": app_name,
+            "user_id": user_id,
+            "state": state or {},
+            "createTime": firestore.SERVER_TIMESTAMP,
+            "updateTime": firestore.SERVER_TIMESTAMP,
+        }
+        # The server timestamps resolve to the commit time, so there's no need to read the doc back.
+        update_time, doc_ref = await self._db.collection(SESSIONS_COLLECTION).add(session_data)
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=doc_ref.id,
+            state=session_data["state"],
+            last_update_time=update_time.timestamp(),
+        )
 
     @override
     async def get_session(
@@ -96,176 +162,280 @@ class FirestoreSessionService(BaseSessionService):
         session_id: str,
         config: Optional[GetSessionConfig] = None,
     ) -> Optional[Session]:
-        """Retrieves a session and its events from Firestore using a thread."""
+        """Retrieves a session and its events, serving repeat full reads from a short-lived cache."""
+        if config:
+            # Windowed reads are cheap already and vary too much to be worth caching.
+            session = await self._fetch_session(session_id, config)
+        else:
+            fetch = self._session_cache.get(session_id)
+            if fetch is None:
+                fetch = asyncio.ensure_future(self._fetch_session(session_id, None))
+                self._session_cache[session_id] = fetch
+            try:
+                # Shielded so a cancelled caller doesn't cancel the read for everyone else.
+                session = await asyncio.shield(fetch)
+            except Exception:
+                if self._session_cache.get(session_id) is fetch:
+                    del self._session_cache[session_id]
+                raise
+            if session is not None:
+                # Callers mutate the session they get back, so never hand out the cached one.
+                session = session.model_copy(deep=True)
+
+        if session is None or session.app_name != app_name or session.user_id != user_id:
+            return None
+        return session
+
+    def _invalidate_session(self, session_id: str) -> None:
+        """Drops any cached read of the session after it has been written to."""
+        self._session_cache.pop(session_id, None)
+
+    async def _fetch_session(
+        self, session_id: str, config: Optional[GetSessionConfig]
+    ) -> Optional[Session]:
+        """Reads a session and its events from Firestore."""
+        session_ref = self._db.collection(SESSIONS_COLLECTION).document(session_id)
+        # Fetch the session and its events concurrently to save a round trip.
+        # The events are discarded by the caller if the session turns out not to match.
+        session_doc, event_docs = await asyncio.gather(
+            session_ref.get(), _collect(_events_query(session_ref, config).stream())
+        )
 
-        def _get_from_firestore():
-            session_ref = self._db.collection(SESSIONS_COLLECTION).document(session_id)
-            session_doc = session_ref.get()
+        if not session_doc.exists:
+            return None
+
+        session_dict = session_doc.to_dict()
+        update_timestamp = session_dict["updateTime"].timestamp()
+        session = Session(
+            app_name=session_dict["app_name"],
+            user_id=session_dict["user_id"],
+            id=session_doc.id,
+            state=session_dict.get("state", {}),
+            last_update_time=update_timestamp,
+        )
 
-            if not session_doc.exists:
-                return None
+        events_list = [_from_firestore_doc_to_event(doc) for doc in event_docs]
+        if config and config.num_recent_events:
+            # The newest events were fetched first; restore chronological order.
+            events_list.reverse()
+        elif config and config.after_timestamp:
+            # The query filters on whole seconds; drop the sub-second remainder here.
+            events_list = [e for e in events_list if e.timestamp > config.after_timestamp]
+        session.events = events_list
 
-            session_dict = session_doc.to_dict()
-            if (
-                session_dict.get("app_name") != app_name
-                or session_dict.get("user_id") != user_id
-            ):
-                return None
+        return session
 
-            update_timestamp = session_dict["updateTime"].timestamp()
+    @override
+    async def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        """Lists all sessions for a given user and app from Firestore."""
+        query = self._db.collection(SESSIONS_COLLECTION).where(
+            filter=FieldFilter("app_name", "==", app_name)
+        ).where(filter=FieldFilter("user_id", "==", user_id))
+        
+        sessions = []
+        async for doc in query.stream():
+            session_dict = doc.to_dict()
             session = Session(
                 app_name=session_dict["app_name"],
                 user_id=session_dict["user_id"],
-                id=session_doc.id,
+                id=doc.id,
                 state=session_dict.get("state", {}),
-                last_update_time=update_timestamp,
+                last_update_time=session_dict["updateTime"].timestamp(),
             )
-
-            # Fetch events without ordering from the database to avoid index requirements.
-            events_ref = session_ref.collection(EVENTS_SUBCOLLECTION)
-            event_docs = events_ref.stream()
-            events_list = [_from_firestore_doc_to_event(doc) for doc in event_docs]
-            # Sort the events in the application code instead.
-            events_list.sort(key=lambda e: e.timestamp)
-            session.events = events_list
-
-            if config:
-                if config.num_recent_events:
-                    session.events = session.events[-config.num_recent_events :]
-                elif config.after_timestamp:
-                    session.events = [e for e in session.events if e.timestamp > config.after_timestamp]
-            
-            return session
-
-        return await asyncio.to_thread(_get_from_firestore)
+            sessions.append(session)
+        return ListSessionsResponse(sessions=sessions)
+
+    async def list_sessions_latest(self, *, app_name: str, user_id: str) -> Optional[Session]:
+        """
+        Returns the user's most recently updated session, or None if there is none.
+        Requires a composite index on (app_name, user_id, updateTime DESC).
+        """
+        query = (
+            self._db.collection(SESSIONS_COLLECTION)
+            .where(filter=FieldFilter("app_name", "==", app_name))
+            .where(filter=FieldFilter("user_id", "==", user_id))
+            .order_by("updateTime", direction=firestore.Query.DESCENDING)
+            .limit(1)
+        )
+        async for doc in query.stream():
+            session_dict = doc.to_dict()
+            return Session(
+                app_name=session_dict["app_name"],
+                user_id=session_dict["user_id"],
+                id=doc.id,
+                state=session_dict.get("state", {}),
+                last_update_time=session_dict["updateTime"].timestamp(),
+            )
+        return None
 
     @override
-    async def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
-        """Lists all sessions for a given user and app from Firestore using a thread."""
-        def _list_from_firestore():
-            query = self._db.collection(SESSIONS_COLLECTION).where(
-                filter=FieldFilter("app_name", "==", app_name)
-            ).where(filter=FieldFilter("user_id", "==", user_id))
-            
-            sessions = []
-            for doc in query.stream():
-                session_dict = doc.to_dict()
-                session = Session(
-                    app_name=session_dict["app_name"],
-                    user_id=session_dict["user_id"],
-                    id=doc.id,
-                    state=session_dict.get("state", {}),
-                    last_update_time=session_dict["updateTime"].timestamp(),
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        """Deletes a session and all its events from Firestore."""
+        session_ref = self._db.collection(SESSIONS_COLLECTION).document(session_id)
+        session_doc = await session_ref.get(field_paths=["app_name", "user_id"])
+        if not session_doc.exists or session_doc.to_dict().get("user_id") != user_id:
+            return
+
+        events_ref = session_ref.collection(EVENTS_SUBCOLLECTION)
+        # An empty projection returns only document names, no field data.
+        doc_refs = [doc.reference async for doc in events_ref.select([]).stream()]
+        doc_refs.append(session_ref)
+
+        def _bulk_delete():
+            # A single WriteBatch is capped at 500 writes. BulkWriter splits the deletes
+            # into batches, commits them in parallel and retries failures. It is a sync API
+            # built on the sync client and close() blocks, hence the worker thread.
+            bulk_writer = self._bulk_db.bulk_writer()
+            # close() returns normally even if nothing was sent, so confirm every delete
+            # came back from the API. The callback runs on the writer's threads.
+            deleted = []
+            bulk_writer.on_write_result(lambda doc_ref, result, writer: deleted.append(doc_ref))
+            for doc_ref in doc_refs:
+                bulk_writer.delete(self._bulk_db.document(doc_ref.path))
+            bulk_writer.close()
+            if len(deleted) != len(doc_refs):
+                raise RuntimeError(
+                    f"Deleted {len(deleted)} of {len(doc_refs)} documents for session '{session_id}'."
                 )
-                sessions.append(session)
-            return ListSessionsResponse(sessions=sessions)
 
-        return await asyncio.to_thread(_list_from_firestore)
-
-    @override
-    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
-        """Deletes a session and all its events from Firestore using a thread."""
-        def _delete_in_firestore():
-            session_ref = self._db.collection(SESSIONS_COLLECTION).document(session_id)
-            session_doc = session_ref.get(field_paths=["app_name", "user_id"])
-            if not session_doc.exists or session_doc.to_dict().get("user_id") != user_id:
-                return
-
-            events_ref = session_ref.collection(EVENTS_SUBCOLLECTION)
-            event_docs = events_ref.list_documents()
-            
-            batch = self._db.batch()
-            for doc in event_docs:
-                batch.delete(doc)
-            batch.delete(session_ref)
-            batch.commit()
-        
-        await asyncio.to_thread(_delete_in_firestore)
+        await asyncio.to_thread(_bulk_delete)
+        self._invalidate_session(session_id)
 
     async def update_session_state(self, session_id: str, state_delta: Dict[str, Any]):
-        """Updates the state of a session document in Firestore."""
-        def _update_in_firestore():
-            session_ref = self._db.collection(SESSIONS_COLLECTION).document(session_id)
-            # Firestore's update with dot notation is perfect for this
-            update_data = {f"state.{key}": value for key, value in state_delta.items()}
-            update_data["updateTime"] = firestore.SERVER_TIMESTAMP
-            session_ref.update(update_data)
-
-        await asyncio.to_thread(_update_in_firestore)
+        """
+        Updates the state of a session document in Firestore. Only the keys in state_delta are
+        sent, each as its own field path. A value may be a Firestore transform such as
+        firestore.Increment(1) or firestore.ArrayUnion([item]); it is applied server-side, so
+        counters and lists don't need to be read and rewritten whole.
+        """
+        if not state_delta:
+            return
+        session_ref = self._db.collection(SESSIONS_COLLECTION).document(session_id)
+        # Firestore's update with dot notation is perfect for this
+        update_data = {f"state.{key}": value for key, value in state_delta.items()}
+        update_data["updateTime"] = firestore.SERVER_TIMESTAMP
+        await session_ref.update(update_data)
+        self._invalidate_session(session_id)
 
     @override
     async def append_event(self, session: Session, event: Event) -> Event:
-        """Appends an event to the session's event subcollection in Firestore using a thread."""
+        """Appends an event to the session's event subcollection in Firestore."""
         await super().append_event(session=session, event=event)
         
-        def _append_in_firestore():
-            logger.info("Starting _append_in_firestore for session '%s'", session.id)
-            try:
-                # Use a batch for atomic writes.
-                batch = self._db.batch()
-                
-                session_ref = self._db.collection(SESSIONS_COLLECTION).document(session.id)
-                
-                # Create a new document for the event in the subcollection.
-                event_doc_ref = session_ref.collection(EVENTS_SUBCOLLECTION).document()
-                event.id = event_doc_ref.id # Assign the new ID to the event object
-                
-                event_data_dict = _convert_event_to_json(event)
-                logger.info("Appending event data: %s", event_data_dict)
-                
-                # Add the event creation to the batch.
-                batch.set(event_doc_ref, event_data_dict)
+        logger.info("Starting append_event for session '%s'", session.id)
+        try:
+            # Use a batch for atomic writes.
+            batch = self._db.batch()
+            
+            session_ref = self._db.collection(SESSIONS_COLLECTION).document(session.id)
+            
+            # Create a new document for the event in the subcollection.
+            event_doc_ref = session_ref.collection(EVENTS_SUBCOLLECTION).document()
+            event.id = event_doc_ref.id # Assign the new ID to the event object
+            
+            event_data_dict = _convert_event_to_json(event)
+            if logger.isEnabledFor(logging.DEBUG):
+                # Event payloads can be large; only encode them when someone is reading.
+                logger.debug("Appending event data: %s", orjson.dumps(event_data_dict, default=str).decode())
+            
+            # Add the event creation to the batch.
+            batch.set(event_doc_ref, event_data_dict)
 
+            # Defensive only: the ADK runner doesn't append partial events, but if one
+            # ever arrives it shouldn't bump the session's updateTime.
+            if not event.partial:
                 # Update the session document's timestamp. State is no longer saved here.
                 batch.update(session_ref, {"updateTime": firestore.SERVER_TIMESTAMP})
-                # Commit the batch.
-                logger.info("Committing batch to Firestore for session '%s'...", session.id)
-                batch.commit()
-                logger.info("Batch committed successfully for session '%s'.", session.id)
-            except Exception as e:
-                # Log any exception that occurs during the process.
-                logger.error(
-                    "!!! Exception in _append_in_firestore for session '%s': %s",
-                    session.id,
-                    e,
-                    exc_info=True
-                )
-        
-        await asyncio.to_thread(_append_in_firestore)
+            # Commit the batch.
+            logger.info("Committing batch to Firestore for session '%s'...", session.id)
+            await batch.commit()
+            self._invalidate_session(session.id)
+            logger.info("Batch committed successfully for session '%s'.", session.id)
+        except Exception as e:
+            # Log any exception that occurs during the process.
+            logger.error(
+                "!!! Exception in append_event for session '%s': %s",
+                session.id,
+                e,
+                exc_info=True
+            )
         return event
 
-def _convert_event_to_json(event: Event) -> Dict[str, Any]:
-  """Serializes an Event object into a JSON-compatible dictionary."""
-  metadata_json = {
-      'partial': event.partial,
-      'turn_complete': event.turn_complete,
-      'interrupted': event.interrupted,
-      'branch': event.branch,
-      'long_running_tool_ids': (
-          list(event.long_running_tool_ids)
-          if event.long_running_tool_ids
-          else None
-      ),
-  }
-  if event.grounding_metadata:
-    metadata_json['grounding_metadata'] = event.grounding_metadata.model_dump(
-        exclude_none=True, mode='json'
+async def _collect(stream) -> list:
+  """Drains an async document stream into a list."""
+  return [doc async for doc in stream]
+
+
+def _events_query(
+    session_ref: firestore.AsyncDocumentReference, config: Optional[GetSessionConfig]
+) -> firestore.AsyncQuery:
+  """
+  Builds the events query with ordering, filtering and limits pushed to Firestore.
+  Timestamps are stored as a {seconds, nanos} map, and maps sort by key name, so
+  ordering is done on the two fields explicitly. This needs composite indexes on
+  the events collection: (timestamp.seconds, timestamp.nanos) ascending and
+  descending.
+  """
+  events_ref = session_ref.collection(EVENTS_SUBCOLLECTION)
+  if config and config.num_recent_events:
+    return (
+        events_ref.order_by("timestamp.seconds", direction=firestore.Query.DESCENDING)
+        .order_by("timestamp.nanos", direction=firestore.Query.DESCENDING)
+        .limit(config.num_recent_events)
+    )
+  query = events_ref
+  if config and config.after_timestamp:
+    query = query.where(
+        filter=FieldFilter("timestamp.seconds", ">=", int(config.after_timestamp))
     )
+  return query.order_by("timestamp.seconds").order_by("timestamp.nanos")
 
+
+def _is_pdf_part(part: Part) -> bool:
+  # Check for inline_data which is how `Part.from_data` stores the PDF
+  return bool(part.inline_data and part.inline_data.mime_type == 'application/pdf')
+
+
+def _convert_event_to_json(event: Event) -> Dict[str, Any]:
+  """Serializes an Event object into a JSON-compatible dictionary."""
+  seconds, fraction = divmod(event.timestamp, 1)
   event_json = {
       'author': event.author,
       'invocation_id': event.invocation_id,
       'timestamp': {
-          'seconds': int(event.timestamp),
-          'nanos': int(
-              (event.timestamp - int(event.timestamp)) * 1_000_000_000
-          ),
+          'seconds': int(seconds),
+          'nanos': int(fraction * 1_000_000_000),
       },
       'error_code': event.error_code,
       'error_message': event.error_message,
-      'event_metadata': metadata_json,
   }
 
+  # Most events (tool results especially) carry no metadata; skip the map entirely for those.
+  if (
+      event.partial
+      or event.turn_complete
+      or event.interrupted
+      or event.branch
+      or event.long_running_tool_ids
+      or event.grounding_metadata
+  ):
+    metadata_json = {
+        'partial': event.partial,
+        'turn_complete': event.turn_complete,
+        'interrupted': event.interrupted,
+        'branch': event.branch,
+        'long_running_tool_ids': (
+            list(event.long_running_tool_ids)
+            if event.long_running_tool_ids
+            else None
+        ),
+    }
+    if event.grounding_metadata:
+      metadata_json['grounding_metadata'] = event.grounding_metadata.model_dump(
+          exclude_none=True, mode='json'
+      )
+    event_json['event_metadata'] = metadata_json
+
   if event.actions:
     actions_json = {
         'skip_summarization': event.actions.skip_summarization,
@@ -277,69 +447,66 @@ def _convert_event_to_json(event: Event) -> Dict[str, Any]:
     }
     event_json['actions'] = actions_json
   if event.content:
-    content_dict = event.content.model_dump(exclude_none=True, mode='json')
-    if event.author == "user" and 'parts' in content_dict:
-        new_parts = []
-        for part in content_dict['parts']:
-            # Check for inline_data which is how `Part.from_data` stores the PDF
-            if 'inline_data' in part and part['inline_data'].get('mime_type') == 'application/pdf':
-                # Replace the large PDF data with a placeholder text
-                new_parts.append({'text': '[PDF content omitted from history]'})
-            else:
-                new_parts.append(part)
-        content_dict['parts'] = new_parts
-    event_json['content'] = content_dict
-  if event.error_code:
-    event_json['error_code'] = event.error_code
-  if event.error_message:
-    event_json['error_message'] = event.error_message
+    content = event.content
+    if event.author == "user" and content.parts and any(_is_pdf_part(part) for part in content.parts):
+        # Swap the PDF for placeholder text before dumping so it is never base64-encoded.
+        content = content.model_copy(update={
+            'parts': [_PDF_PLACEHOLDER_PART if _is_pdf_part(part) else part for part in content.parts]
+        })
+    event_json['content'] = content.model_dump(exclude_none=True, mode='json')
   return event_json
 
 
+# (stored key, EventActions field) pairs, matching what _convert_event_to_json writes.
+_ACTION_FIELDS = (
+    ("skip_summarization", "skip_summarization"),
+    ("state_delta", "state_delta"),
+    ("artifact_delta", "artifact_delta"),
+    ("transfer_agent", "transfer_to_agent"),
+    ("escalate", "escalate"),
+    ("requested_auth_configs", "requested_auth_configs"),
+)
+_METADATA_FIELDS = ("partial", "turn_complete", "interrupted", "branch")
+
+
 def _from_firestore_doc_to_event(doc: firestore.DocumentSnapshot) -> Event:
     """Deserializes a Firestore document into an Event object."""
     event_dict = doc.to_dict()
-    event_actions = EventActions()
-    if event_dict.get("actions", None):
-        actions_data = event_dict["actions"]
-        event_actions = EventActions(
-            skip_summarization=actions_data.get("skipSummarization", None),
-            state_delta=actions_data.get("stateDelta", {}),
-            artifact_delta=actions_data.get("artifactDelta", {}),
-            transfer_to_agent=actions_data.get("transferAgent", None),
-            escalate=actions_data.get("escalate", None),
-            requested_auth_configs=actions_data.get("requestedAuthConfigs", {}),
-        )
+    get = event_dict.get
+
+    actions_data = get("actions")
+    if actions_data:
+        # Unset fields keep the EventActions defaults.
+        event_actions = EventActions(**{
+            field: actions_data[key]
+            for key, field in _ACTION_FIELDS
+            if actions_data.get(key) is not None
+        })
+    else:
+        event_actions = EventActions()
 
     ts_map = event_dict["timestamp"]
-    timestamp_float = ts_map["seconds"] + ts_map.get("nanos", 0) / 1_000_000_000
-
-    content_dict = event_dict.get("content", None)
-    content = Content(**content_dict) if content_dict else None
-
-    event = Event(
+    content_dict = get("content")
+
+    event_kwargs = {}
+    metadata = get("event_metadata")
+    if metadata:
+        for key in _METADATA_FIELDS:
+            value = metadata.get(key)
+            if value is not None:
+                event_kwargs[key] = value
+        long_running_tool_ids_list = metadata.get("long_running_tool_ids")
+        if long_running_tool_ids_list:
+            event_kwargs["long_running_tool_ids"] = set(long_running_tool_ids_list)
+
+    return Event(
         id=doc.id,
         invocation_id=event_dict["invocation_id"],
         author=event_dict["author"],
         actions=event_actions,
-        content=content,
-        timestamp=timestamp_float,
-        error_code=event_dict.get("error_code", None),
-        error_message=event_dict.get("error_message", None),
+        content=Content(**content_dict) if content_dict else None,
+        timestamp=ts_map.get("seconds", 0) + ts_map.get("nanos", 0) * 1e-9,
+        error_code=get("error_code"),
+        error_message=get("error_message"),
+        **event_kwargs,
     )
-
-    if event_dict.get("event_metadata", None):
-        metadata = event_dict["event_metadata"]
-        long_running_tool_ids_list = metadata.get("long_running_tool_ids", None)
-        event.partial = metadata.get("partial", None)
-        event.turn_complete = metadata.get("turn_complete", None)
-        event.interrupted = metadata.get("interrupted", None)
-        event.branch = metadata.get("branch", None)
-        # grounding_metadata_dict = metadata.get("grounding_metadata", None)
-        # if grounding_metadata_dict:
-        #     event.grounding_metadata = GroundingMetadata(**grounding_metadata_dict)
-        event.long_running_tool_ids = (
-            set(long_running_tool_ids_list) if long_running_tool_ids_list else None
-        )
-
-    return event
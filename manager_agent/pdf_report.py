@@ -0,0 +1,42 @@
+"""Renders the structured investment memo JSON into a PDF document."""
+import io
+from collections import deque
+from functools import lru_cache
+
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+from reportlab.lib.styles import getSampleStyleSheet
+
+# --- PDF Styles ---
+# Built once at import; the memo layout doesn't depend on the request.
+_STYLES = getSampleStyleSheet()
+_H1, _H2, _NORMAL = _STYLES["Heading1"], _STYLES["Heading2"], _STYLES["Normal"]
+LEVEL_STYLE = {1: _H1}
+
+@lru_cache(maxsize=256)
+def _section_title(key):
+    """Turns a memo field name like 'team_analysis' into a heading ('Team Analysis')."""
+    return key.replace("_", " ").title()
+
+def generate_pdf_from_json(json_data):
+    """Renders the memo into an in-memory PDF and returns the BytesIO holding it."""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    story = []
+    # Walk the memo depth-first with an explicit stack; children are pushed in
+    # reverse so they are emitted in document order.
+    stack = deque([("Investment Memo", json_data.get("investment_memo", json_data), 1)])
+    while stack:
+        title, content, level = stack.pop()
+        if title:
+            story.append(Paragraph(title, LEVEL_STYLE.get(level, _H2)))
+        story.append(Spacer(1, 8))
+        if isinstance(content, dict):
+            stack.extend((_section_title(k), v, level + 1) for k, v in reversed(content.items()))
+        elif isinstance(content, list):
+            stack.extend((None, item, level + 1) for item in reversed(content))
+        else:
+            story.extend((Paragraph(str(content), _NORMAL), Spacer(1, 6)))
+    doc.build(story)
+    # Hand back the buffer itself so the upload can stream from it without an extra copy.
+    return buffer
@@ -0,0 +1,63 @@
+from google.cloud import bigquery
+from google.cloud import bigquery_storage
+from typing import Optional
+import cachetools.func
+import os
+
+# --- Configuration ---
+PROJECT_ID = os.environ.get("GCP_PROJECT", "valued-mediator-461216-k7")
+BIGQUERY_DATASET_ID = os.environ.get("BIGQUERY_DATASET_ID", "venture_ai_test_dataset")
+BIGQUERY_TABLE_ID = os.environ.get("BIGQUERY_TABLE_ID", "pitch_deck_analysis")
+
+# Shared by every agent tool that looks up an analysis. Clients are built once;
+# constructing them per call re-reads credentials and reconnects.
+_BQ_CLIENT = bigquery.Client(project=PROJECT_ID)
+_BQ_READ = bigquery_storage.BigQueryReadClient()
+_TABLE_PATH = f"projects/{PROJECT_ID}/datasets/{BIGQUERY_DATASET_ID}/tables/{BIGQUERY_TABLE_ID}"
+_TABLE_REF = f"{PROJECT_ID}.{BIGQUERY_DATASET_ID}.{BIGQUERY_TABLE_ID}"
+_QUERY = f"SELECT * FROM `{_TABLE_REF}` WHERE analysis_id = @analysis_id"
+
+def _read_analysis_row(analysis_id: str) -> Optional[dict]:
+    """Point-reads one row through the Storage Read API, avoiding the query job start-up cost."""
+    escaped_id = analysis_id.replace("\\", "\\\\").replace('"', '\\"')
+    read_session = _BQ_READ.create_read_session(
+        parent=f"projects/{PROJECT_ID}",
+        read_session=bigquery_storage.types.ReadSession(
+            table=_TABLE_PATH,
+            data_format=bigquery_storage.types.DataFormat.ARROW,
+            read_options=bigquery_storage.types.ReadSession.TableReadOptions(
+                row_restriction=f'analysis_id = "{escaped_id}"'
+            ),
+        ),
+        max_stream_count=1,
+    )
+    if not read_session.streams:
+        return None
+    rows = _BQ_READ.read_rows(read_session.streams[0].name).to_arrow(read_session).to_pylist()
+    return rows[0] if rows else None
+
+# Every chat turn re-reads the same analysis row, which never changes once written.
+@cachetools.func.ttl_cache(maxsize=256, ttl=60)
+def _fetch_analysis_row(analysis_id: str) -> dict:
+    """Queries BigQuery for a single analysis row, raising LookupError (not cached) if it doesn't exist."""
+    row = _read_analysis_row(analysis_id)
+    if row is not None:
+        return row
+    # Rows still in the streaming buffer may not be visible to the read session yet.
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ScalarQueryParameter("analysis_id", "STRING", analysis_id),
+        ]
+    )
+    query_job = _BQ_CLIENT.query(_QUERY, job_config=job_config)
+    for row in query_job.result():
+        return dict(row)
+    raise LookupError(analysis_id)
+
+def fetch_analysis_data(analysis_id: str) -> dict:
+    """Returns the analysis row for analysis_id, or an error dict if there is none."""
+    try:
+        # Copy so callers can't modify the cached row.
+        return dict(_fetch_analysis_row(analysis_id))
+    except LookupError:
+        return {"error": f"No analysis found for ID: {analysis_id}"}
@@ -55,9 +55,9 @@ report_generation_agent = Agent(
     model="gemini-2.5-pro",
     description="Synthesizes pitch deck data and web research into a final investment memo.",
     instruction="""
-    You are a senior VC partner. You will be given two JSON objects:
-    1. The original claims extracted from a pitch deck.
-    2. The enriched data and verifications from a research analyst.
+    You are a senior VC partner. You will be given:
+    1. A JSON object with the original claims extracted from a pitch deck.
+    2. JSON objects with the enriched data and verifications from the research analysts, one each for the market, competitors, founders and traction.
 
     Your task is to synthesize all of this information into a final, comprehensive investment memo.
     Where the internal claims and external research differ, you must highlight the discrepancy in your analysis.
@@ -1,19 +1,55 @@
-from google.adk.agents import Agent
+from google.adk.agents import Agent, ParallelAgent
 from google.adk.tools import google_search
 
-web_research_analyst_agent = Agent(
-    name="web_research_analyst",
-    model="gemini-2.5-flash",
-    description="Researches and verifies information from a pitch deck using Google.",
-    instruction="""
+# --- Research Focus Areas ---
+# Each area is verified independently, so they are researched in parallel
+# rather than one after another by a single agent.
+
+RESEARCH_FOCUS_AREAS = {
+    "market_research_analyst": (
+        "Verifying the market size (TAM/SAM) and market growth rate claimed in the deck.",
+        "market_research",
+    ),
+    "competitor_research_analyst": (
+        "Researching the named competitors and finding any unmentioned ones.",
+        "competitor_research",
+    ),
+    "founder_research_analyst": (
+        "Finding the professional backgrounds of the founders.",
+        "founder_research",
+    ),
+    "traction_research_analyst": (
+        "Looking for any news articles or public data related to the company's traction.",
+        "traction_research",
+    ),
+}
+
+
+def _research_agent(name: str, focus: str, output_key: str) -> Agent:
+    return Agent(
+        name=name,
+        model="gemini-2.5-flash",
+        description=f"Researches one aspect of a pitch deck using Google: {focus}",
+        instruction=f"""
     You are a research analyst. You will be given a JSON object containing claims from a startup's pitch deck.
     Your task is to use the google_search tool to independently verify these claims and find additional, publicly available information.
-    Focus on:
-    - Verifying the market size.
-    - Researching the named competitors and finding any unmentioned ones.
-    - Finding the professional backgrounds of the founders.
-    - Looking for any news articles or public data related to the company's traction.
+    Focus only on:
+    - {focus}
+    Other analysts are covering the remaining areas in parallel, so do not research them.
+    Plan every search query you need up front and issue them together in a single google_search step rather than one at a time.
+    Do not repeat a query you have already run; reuse its results instead.
     Output your findings as a new, enriched JSON object. Clearly cite your sources with URLs in your output.
     """,
-    tools=[google_search],
-)
\ No newline at end of file
+        tools=[google_search],
+        output_key=output_key,
+    )
+
+
+web_research_analyst_agent = ParallelAgent(
+    name="web_research_analyst",
+    description="Researches and verifies information from a pitch deck using Google, covering each focus area in parallel.",
+    sub_agents=[
+        _research_agent(name, focus, output_key)
+        for name, (focus, output_key) in RESEARCH_FOCUS_AREAS.items()
+    ],
+)